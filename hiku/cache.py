@@ -2,10 +2,7 @@ import abc
 import contextlib
 import hashlib
 
-from collections import (
-    defaultdict,
-    deque,
-)
+from collections import defaultdict
 from dataclasses import dataclass
 from typing import (
     TYPE_CHECKING,
@@ -13,7 +10,6 @@ from typing import (
     Dict,
     List,
     Union,
-    Deque,
     Iterator,
     Optional,
     Callable,
@@ -152,11 +148,11 @@ class CacheVisitor(QueryVisitor):
         self._cache = cache
         self._index = index
         self._graph = graph
-        self._node = deque([node])
-        self._req: Deque[Any] = deque()
-        self._data: Deque[Dict] = deque()
-        self._to_cache: Deque[Dict] = deque()
-        self._node_idx: Deque[Dict] = deque()
+        self._node = [node]
+        self._req: List[Any] = []
+        self._data: List[Dict] = []
+        self._to_cache: List[Dict] = []
+        self._node_idx: List[Dict] = []
 
     def visit_field(self, field: QueryField) -> None:
         self._data[-1][field.index_key] = self._node_idx[-1][field.index_key]
@@ -1,12 +1,21 @@
-from collections import deque
+from functools import partial
+from operator import itemgetter
 from typing import (
-    Deque,
+    Any,
+    Callable,
     Dict,
+    FrozenSet,
+    List,
+    MutableMapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    cast,
 )
+from weakref import WeakKeyDictionary
 
 from ..graph import Graph
 from ..query import (
-    QueryVisitor,
     Link,
     Field,
     Node,
@@ -17,11 +26,34 @@ from ..types import (
     OptionalMeta,
     SequenceMeta,
     get_type,
+    GenericMeta,
     RecordMeta,
 )
 
 
-class Denormalize(QueryVisitor):
+LinkHandler = Callable[[Any, Node], Any]
+
+#: (record id, link name) -> (handler method name, linked type name,
+#: linked record)
+_LinkTypes = Dict[Tuple[int, str], Tuple[str, str, RecordMeta]]
+
+# graph types are not changing after graph construction, so links are
+# resolved only once per graph and reused by every denormalization pass
+_LINK_TYPES: MutableMapping[Graph, _LinkTypes] = WeakKeyDictionary()
+
+
+class _NodePlan(NamedTuple):
+    keys: Tuple[str, ...]
+    data_fields: Tuple[str, ...]
+    data_getter: Optional[Callable[[Proxy], Any]]
+    fields: Tuple[Field, ...]
+    links: Tuple[Link, ...]
+
+
+class Denormalize:
+    #: names of the fields, which are not loaded from the result, but computed
+    #: by the :py:meth:`_field` method
+    _computed_fields: FrozenSet[str] = frozenset()
 
     def __init__(
         self,
@@ -30,52 +62,121 @@ class Denormalize(QueryVisitor):
     ) -> None:
         self._types = graph.__types__
         self._result = result
-        self._type: Deque[RecordMeta] = deque([self._types['__root__']])
-        self._data = deque([result])
-        self._res: Deque = deque()
+        self._root_name = '__root__'
+        self._root: RecordMeta = self._types['__root__']
+        self._link_types = _LINK_TYPES.setdefault(graph, {})
+        self._link_dispatch: Dict[Tuple[int, str], LinkHandler] = {}
+        self._plans: Dict[int, _NodePlan] = {}
 
     def process(self, query: Node) -> Dict:
-        assert not self._res, self._res
-        self._res.append({})
-        self.visit(query)
-        return self._res.pop()
+        return self._walk(self._root_name, self._root, self._result, query)
+
+    def _plan(self, node: Node) -> _NodePlan:
+        data_fields = []
+        fields = []
+        links = []
+        for obj in node.fields:
+            if obj.__class__ is Link:
+                links.append(cast(Link, obj))
+            elif obj.name in self._computed_fields:
+                fields.append(cast(Field, obj))
+            else:
+                data_fields.append(obj.result_key)
+        return _NodePlan(
+            tuple(f.result_key for f in node.fields),
+            tuple(data_fields),
+            itemgetter(*data_fields) if data_fields else None,
+            tuple(fields),
+            tuple(links),
+        )
+
+    def _walk(
+        self,
+        type_name: str,
+        type_: RecordMeta,
+        data: Proxy,
+        node: Node,
+    ) -> Dict:
+        plan = self._plans.get(id(node))
+        if plan is None:
+            plan = self._plans[id(node)] = self._plan(node)
 
-    def visit_field(self, obj: Field) -> None:
-        self._res[-1][obj.result_key] = self._data[-1][obj.result_key]
+        # result keys are populated in advance to preserve fields order
+        res = dict.fromkeys(plan.keys)
+        if plan.data_getter is not None:
+            if len(plan.data_fields) == 1:
+                res[plan.data_fields[0]] = plan.data_getter(data)
+            else:
+                res.update(zip(plan.data_fields, plan.data_getter(data)))
+        for field in plan.fields:
+            res[field.result_key] = self._field(type_name, type_, data,
+                                                field)
+        if plan.links:
+            type_id = id(type_)
+            link_dispatch = self._link_dispatch
+            for link in plan.links:
+                key = (type_id, link.name)
+                handler = link_dispatch.get(key)
+                if handler is None:
+                    handler = link_dispatch[key] = self._link_handler(key,
+                                                                      type_)
+                res[link.result_key] = handler(data[link.result_key],
+                                               link.node)
+        return res
+
+    def _field(
+        self,
+        type_name: str,
+        type_: RecordMeta,
+        data: Proxy,
+        obj: Field,
+    ) -> Any:
+        return data[obj.result_key]
+
+    def _link_handler(
+        self,
+        key: Tuple[int, str],
+        type_: RecordMeta,
+    ) -> LinkHandler:
+        resolved = self._link_types.get(key)
+        if resolved is None:
+            resolved = self._link_types[key] = self._resolve_link(
+                type_.__field_types__[key[1]]
+            )
+        method, type_name, record = resolved
+        return partial(getattr(self, method), type_name, record)
 
-    def visit_link(self, obj: Link) -> None:
-        type_ = self._type[-1].__field_types__[obj.name]
+    def _resolve_link(self, type_: GenericMeta) -> Tuple[str, str, RecordMeta]:
+        method: str
         if isinstance(type_, TypeRefMeta):
-            self._type.append(get_type(self._types, type_))
-            self._res.append({})
-            self._data.append(self._data[-1][obj.result_key])
-            super().visit_link(obj)
-            self._data.pop()
-            self._res[-1][obj.result_key] = self._res.pop()
-            self._type.pop()
+            method, type_ref = '_walk', type_
         elif isinstance(type_, SequenceMeta):
             assert isinstance(type_.__item_type__, TypeRefMeta)
-            self._type.append(get_type(self._types, type_.__item_type__))
-            items = []
-            for item in self._data[-1][obj.result_key]:
-                self._res.append({})
-                self._data.append(item)
-                super().visit_link(obj)
-                self._data.pop()
-                items.append(self._res.pop())
-            self._res[-1][obj.result_key] = items
-            self._type.pop()
+            method, type_ref = '_handle_seq', type_.__item_type__
         elif isinstance(type_, OptionalMeta):
-            if self._data[-1][obj.result_key] is None:
-                self._res[-1][obj.result_key] = None
-            else:
-                assert isinstance(type_.__type__, TypeRefMeta)
-                self._type.append(get_type(self._types, type_.__type__))
-                self._res.append({})
-                self._data.append(self._data[-1][obj.result_key])
-                super().visit_link(obj)
-                self._data.pop()
-                self._res[-1][obj.result_key] = self._res.pop()
-                self._type.pop()
+            assert isinstance(type_.__type__, TypeRefMeta)
+            method, type_ref = '_handle_opt', type_.__type__
         else:
             raise AssertionError(repr(type_))
+        return (method, type_ref.__type_name__,
+                get_type(self._types, type_ref))
+
+    def _handle_seq(
+        self,
+        type_name: str,
+        type_: RecordMeta,
+        value: List,
+        node: Node,
+    ) -> List:
+        return [self._walk(type_name, type_, item, node) for item in value]
+
+    def _handle_opt(
+        self,
+        type_name: str,
+        type_: RecordMeta,
+        value: Any,
+        node: Node,
+    ) -> Any:
+        if value is None:
+            return None
+        return self._walk(type_name, type_, value, node)
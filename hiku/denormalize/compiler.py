@@ -0,0 +1,187 @@
+import weakref
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    MutableMapping,
+    Optional,
+    Tuple,
+)
+
+from ..compat import ast as py
+from ..graph import Graph
+from ..query import Link, Node
+from ..result import Proxy
+from ..types import (
+    TypeRefMeta,
+    OptionalMeta,
+    SequenceMeta,
+    RecordMeta,
+    get_type,
+)
+
+
+Denormalizer = Callable[[Proxy], Dict]
+
+
+class DenormalizeCompiler:
+    """Compiles query into a set of Python functions, which are doing the
+    same as :py:class:`~hiku.denormalize.base.Denormalize`, but without
+    query and types interpretation at runtime
+
+    If root type name is specified, ``__typename`` fields are compiled
+    into constants, like
+    :py:class:`~hiku.denormalize.graphql.DenormalizeGraphQL` does.
+    """
+    data_var = 'data'
+
+    def __init__(self, graph: Graph, compile_typenames: bool = False) -> None:
+        self._types = graph.__types__
+        self._compile_typenames = compile_typenames
+        self._funcs: List[Any] = []
+
+    @classmethod
+    def compile_query(
+        cls,
+        graph: Graph,
+        query: Node,
+        root_type_name: Optional[str] = None,
+    ) -> Denormalizer:
+        compiler = cls(graph, root_type_name is not None)
+        root_name = compiler._node_func(compiler._types['__root__'],
+                                        root_type_name, query)
+        env: Dict[str, Any] = {}
+        for index, expr in enumerate(compiler._funcs):
+            code = py.Expression(expr)
+            py.fix_missing_locations(code)
+            env[cls._func_name(index)] = eval(compile(code, '<denormalize>',
+                                                      'eval'), env)
+        return env[root_name]
+
+    @staticmethod
+    def _func_name(index: int) -> str:
+        return 'node_{}'.format(index)
+
+    def _data_load(self, key: str) -> Any:
+        return py.Subscript(py.Name(self.data_var, py.Load()),
+                            py.Index(py.Str(key)), py.Load())
+
+    def _node_func(
+        self,
+        type_: RecordMeta,
+        type_name: Optional[str],
+        node: Node,
+        optional: bool = False,
+    ) -> str:
+        # reserving function name before compiling nested nodes
+        index = len(self._funcs)
+        self._funcs.append(None)
+
+        body = self._node_expr(type_, type_name, node)
+        if optional:
+            test = py.Compare(py.Name(self.data_var, py.Load()), [py.Is()],
+                              [py.NameConstant(None)])
+            body = py.IfExp(test, py.NameConstant(None), body)
+        args = py.arguments([], [py.arg(self.data_var, None)], None, [], [],
+                            None, [])
+        self._funcs[index] = py.Lambda(args, body)
+        return self._func_name(index)
+
+    def _node_expr(
+        self,
+        type_: RecordMeta,
+        type_name: Optional[str],
+        node: Node,
+    ) -> Any:
+        keys = []
+        values = []
+        for obj in node.fields:
+            keys.append(py.Str(obj.result_key))
+            if obj.__class__ is Link:
+                assert isinstance(obj, Link)
+                values.append(self._link_expr(type_, obj))
+            elif obj.name == '__typename' and type_name is not None:
+                values.append(py.Str(type_name))
+            else:
+                values.append(self._data_load(obj.result_key))
+        return py.Dict(keys, values)
+
+    def _type_name(self, type_ref: TypeRefMeta) -> Optional[str]:
+        # __typename fields are loaded from the data, like in
+        # Denormalize, unless they are compiled into constants
+        return type_ref.__type_name__ if self._compile_typenames else None
+
+    def _link_expr(self, type_: RecordMeta, obj: Link) -> Any:
+        link_type = type_.__field_types__[obj.name]
+        value = self._data_load(obj.result_key)
+        if isinstance(link_type, TypeRefMeta):
+            func = self._node_func(get_type(self._types, link_type),
+                                   self._type_name(link_type), obj.node)
+            return py.Call(py.Name(func, py.Load()), [value], [])
+        elif isinstance(link_type, SequenceMeta):
+            item_type = link_type.__item_type__
+            assert isinstance(item_type, TypeRefMeta), item_type
+            func = self._node_func(get_type(self._types, item_type),
+                                   self._type_name(item_type), obj.node)
+            items = py.Call(py.Name('map', py.Load()),
+                            [py.Name(func, py.Load()), value], [])
+            return py.Call(py.Name('list', py.Load()), [items], [])
+        elif isinstance(link_type, OptionalMeta):
+            ref_type = link_type.__type__
+            assert isinstance(ref_type, TypeRefMeta), ref_type
+            func = self._node_func(get_type(self._types, ref_type),
+                                   self._type_name(ref_type), obj.node,
+                                   optional=True)
+            return py.Call(py.Name(func, py.Load()), [value], [])
+        else:
+            raise AssertionError(repr(link_type))
+
+
+_CompiledQueries = Dict[
+    Tuple[int, Optional[str]],
+    Tuple['weakref.ReferenceType[Node]', Denormalizer],
+]
+
+_CACHE: MutableMapping[Graph, _CompiledQueries] = weakref.WeakKeyDictionary()
+
+
+def compile_denormalizer(
+    graph: Graph,
+    query: Node,
+    root_type_name: Optional[str] = None,
+) -> Denormalizer:
+    """Returns function to denormalize results of the query
+
+    Compiled functions are cached for every graph and query object, so it is
+    beneficial to use it for queries which are executed many times.
+
+    Example:
+
+    .. code-block:: python
+
+        denormalize = compile_denormalizer(graph, query)
+        result = engine.execute(graph, query)
+        data = denormalize(result)
+
+    :param graph: :py:class:`~hiku.graph.Graph` used to execute the query
+    :param query: :py:class:`~hiku.query.Node`
+    :param root_type_name: GraphQL type name of the root node, to compile
+                           ``__typename`` fields
+    :return: function, which accepts :py:class:`~hiku.result.Proxy` and
+             returns denormalized result
+    """
+    compiled = _CACHE.setdefault(graph, {})
+
+    key = (id(query), root_type_name)
+    entry = compiled.get(key)
+    if entry is not None and entry[0]() is query:
+        return entry[1]
+
+    func = DenormalizeCompiler.compile_query(graph, query, root_type_name)
+    # entry is removed together with the query to not reuse it when another
+    # query gets the same id
+    ref = weakref.ref(query, lambda _: compiled.pop(key, None))
+    compiled[key] = (ref, func)
+    return func
@@ -1,19 +1,15 @@
-from collections import deque
+from typing import Any
 
 from ..graph import Graph
-from ..query import Field, Link
+from ..query import Field
 from ..result import Proxy
-from ..types import (
-    TypeRefMeta,
-    SequenceMeta,
-    OptionalMeta,
-    GenericMeta,
-)
+from ..types import RecordMeta
 
 from .base import Denormalize
 
 
 class DenormalizeGraphQL(Denormalize):
+    _computed_fields = frozenset(['__typename'])
 
     def __init__(
         self,
@@ -22,27 +18,16 @@ class DenormalizeGraphQL(Denormalize):
         root_type_name: str
     ) -> None:
         super().__init__(graph, result)
-        self._type_name = deque([root_type_name])
+        self._root_name = root_type_name
 
-    def visit_field(self, obj: Field) -> None:
+    def _field(
+        self,
+        type_name: str,
+        type_: RecordMeta,
+        data: Proxy,
+        obj: Field,
+    ) -> Any:
         if obj.name == '__typename':
-            self._res[-1][obj.result_key] = self._type_name[-1]
-        else:
-            super().visit_field(obj)
-
-    def visit_link(self, obj: Link) -> None:
-        type_ = self._type[-1].__field_types__[obj.name]
-        type_ref: GenericMeta
-        if isinstance(type_, TypeRefMeta):
-            type_ref = type_
-        elif isinstance(type_, SequenceMeta):
-            type_ref = type_.__item_type__
-            assert isinstance(type_ref, TypeRefMeta), type_ref
-        elif isinstance(type_, OptionalMeta):
-            type_ref = type_.__type__
-            assert isinstance(type_ref, TypeRefMeta), type_ref
+            return type_name
         else:
-            raise AssertionError(repr(type_))
-        self._type_name.append(type_ref.__type_name__)
-        super().visit_link(obj)
-        self._type_name.pop()
+            return super()._field(type_name, type_, data, obj)
@@ -11,6 +11,8 @@ from ..graph import (
 )
 from ..query import (
     QueryTransformer,
+    Field,
+    Link,
     Node,
 )
 from ..result import Proxy
@@ -39,11 +41,30 @@ class GraphQLError(Exception):
 
 
 class _StripQuery(QueryTransformer):
-    """Removes __typename fields from query"""
+    """Removes __typename fields from query
+
+    Query objects are not modified after they are read, so unchanged parts of
+    the query are returned as is instead of being copied.
+    """
+
+    def visit_field(self, obj: Field) -> Field:
+        return obj
+
+    def visit_link(self, obj: Link) -> Link:
+        node = self.visit(obj.node)
+        if node is obj.node:
+            return obj
+        return obj.copy(node=node)
 
     def visit_node(self, obj: Node) -> Node:
-        return obj.copy(fields=[self.visit(f) for f in obj.fields
-                                if f.name != '__typename'])
+        fields = [self.visit(f) for f in obj.fields
+                  if f.name != '__typename']
+        if (
+            len(fields) == len(obj.fields)
+            and all(a is b for a, b in zip(fields, obj.fields))
+        ):
+            return obj
+        return obj.copy(fields=fields)
 
 
 def _switch_graph(
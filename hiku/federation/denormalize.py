@@ -1,5 +1,3 @@
-from collections import deque
-
 from hiku.denormalize.graphql import DenormalizeGraphQL
 from hiku.graph import Graph
 from hiku.result import Proxy
@@ -13,4 +11,4 @@ class DenormalizeEntityGraphQL(DenormalizeGraphQL):
         root_type_name: str
     ) -> None:
         super().__init__(graph, result, root_type_name)
-        self._type = deque([graph.__types__[root_type_name]])
+        self._root = graph.__types__[root_type_name]
@@ -1,5 +1,8 @@
 import typing as t
+import threading
+import weakref
 
+from functools import lru_cache
 from math import isfinite
 from typing import (
     Optional,
@@ -26,7 +29,6 @@ from hiku.graph import (
     Field,
     Node,
     Root,
-    GraphTransformer,
     Graph,
     Option,
 )
@@ -44,10 +46,29 @@ from hiku.types import (
 )
 
 
+# graphql-core doesn't mutate nodes while printing them, so the same name
+# node can be shared by every place in the document where it occurs
+@lru_cache(maxsize=None)
 def _name(value: t.Optional[str]) -> t.Optional[ast.NameNode]:
     return ast.NameNode(value=value) if value is not None else None
 
 
+_NAME_ANY = _name('Any')
+_NAME_QUERY = _name('Query')
+_NAME_KEY = _name('key')
+_NAME_PROVIDES = _name('provides')
+_NAME_REQUIRES = _name('requires')
+_NAME_EXTERNAL = _name('external')
+_NAME_EXTENDS = _name('extends')
+_NAME_DEPRECATED = _name('deprecated')
+_NAME_FIELDS = _name('fields')
+_NAME_REASON = _name('reason')
+
+_ANY_TYPE = ast.ScalarTypeDefinitionNode(name=_NAME_ANY)
+_EXTERNAL_DIRECTIVE = ast.DirectiveNode(name=_NAME_EXTERNAL)
+_EXTENDS_DIRECTIVE = ast.DirectiveNode(name=_NAME_EXTENDS)
+
+
 @t.overload
 def coerce_type(x: str) -> ast.NameNode: ...
 
@@ -66,29 +87,47 @@ def _non_null_type(val: t.Union[str, ast.Node]) -> ast.NonNullTypeNode:
     return ast.NonNullTypeNode(type=coerce_type(val))
 
 
-def _encode_type(value: t.Any) -> t.Union[
+_EMPTY: t.List[t.Any] = []
+
+_SCALAR_NAMES = {
+    IntegerMeta: 'Int',
+    StringMeta: 'String',
+    BooleanMeta: 'Boolean',
+    AnyMeta: 'Any',
+    FloatMeta: 'Float',
+}
+
+EncodedType = t.Union[
     ast.NonNullTypeNode,
     ast.NameNode,
-]:
+]
+
+
+def _scalar_name(val: t.Any) -> t.Optional[str]:
+    scalar_name = _SCALAR_NAMES.get(type(val))
+    if scalar_name is not None:
+        return scalar_name
+    # subclasses of the builtin scalar types
+    for base in type(val).__mro__:
+        scalar_name = _SCALAR_NAMES.get(base)
+        if scalar_name is not None:
+            return scalar_name
+    return None
+
+
+def _encode_type(value: t.Any) -> EncodedType:
     def _encode(
         val: t.Optional[GenericMeta]
     ) -> t.Union[str, t.Tuple, ast.ListTypeNode]:
-        if isinstance(val, OptionalMeta):
+        scalar_name = _scalar_name(val)
+        if scalar_name is not None:
+            return scalar_name
+        elif isinstance(val, OptionalMeta):
             return _encode(val.__type__), True
         elif isinstance(val, TypeRefMeta):
             return val.__type_name__
-        elif isinstance(val, IntegerMeta):
-            return 'Int'
-        elif isinstance(val, StringMeta):
-            return 'String'
-        elif isinstance(val, BooleanMeta):
-            return 'Boolean'
         elif isinstance(val, SequenceMeta):
             return ast.ListTypeNode(type=_encode_type(val.__item_type__))
-        elif isinstance(val, AnyMeta):
-            return 'Any'
-        elif isinstance(val, FloatMeta):
-            return 'Float'
         elif val is None:
             return ''
         else:
@@ -104,42 +143,72 @@ def _encode_type(value: t.Any) -> t.Union[
     return _non_null_type(encoded)
 
 
-def _encode_default_value(value: t.Any) -> Optional[ast.ValueNode]:
-    if value == Nothing:
-        return None
+def _encode_float(value: float) -> ast.FloatValueNode:
+    if not isfinite(value):
+        raise TypeError(f"Cannot convert value to AST: {inspect(value)}.")
+    return ast.FloatValueNode(value=f"{value:g}")
 
-    if value is None:
-        return ast.NullValueNode()
 
-    if isinstance(value, bool):
-        return ast.BooleanValueNode(value=value)
+_DEFAULT_VALUE_ENCODERS: t.Dict[type, t.Callable[[t.Any], ast.ValueNode]] = {
+    type(None): lambda value: ast.NullValueNode(),
+    bool: lambda value: ast.BooleanValueNode(value=value),
+    int: lambda value: ast.IntValueNode(value=f"{value:d}"),
+    float: _encode_float,
+    str: lambda value: ast.StringValueNode(value=value),
+}
 
-    if isinstance(value, int):
-        return ast.IntValueNode(value=f"{value:d}")
-    if isinstance(value, float) and isfinite(value):
-        return ast.FloatValueNode(value=f"{value:g}")
 
-    if isinstance(value, str):
-        return ast.StringValueNode(value=value)
+def _encode_default_value(value: t.Any) -> Optional[ast.ValueNode]:
+    encoder = _DEFAULT_VALUE_ENCODERS.get(type(value))
+    if encoder is not None:
+        return encoder(value)
 
-    if isinstance(value, Iterable) and not isinstance(value, str):
-        maybe_value_nodes = (_encode_default_value(item) for item in value)
-        value_nodes: t.List[ast.ValueNode] = list(
-            filter(None, maybe_value_nodes)
-        )
-        return ast.ListValueNode(values=[value_nodes])
+    if value == Nothing:
+        return None
+
+    # subclasses of the builtin types, enums for example
+    for base in type(value).__mro__:
+        encoder = _DEFAULT_VALUE_ENCODERS.get(base)
+        if encoder is not None:
+            return encoder(value)
+
+    if isinstance(value, Iterable):
+        value_nodes: t.List[ast.ValueNode] = []
+        for item in value:
+            item_node = _encode_default_value(item)
+            if item_node is not None:
+                value_nodes.append(item_node)
+        return ast.ListValueNode(values=value_nodes)
 
     raise TypeError(f"Cannot convert value to AST: {inspect(value)}.")
 
 
 class Exporter(GraphVisitor):
+    def __init__(self) -> None:
+        # graph types are not changing while SDL is generated, so encoded
+        # types can be safely cached by the type's identity
+        self._encoded_types: t.Dict[int, EncodedType] = {}
+
+    def _encode_type(self, value: t.Any) -> EncodedType:
+        key = id(value)
+        try:
+            return self._encoded_types[key]
+        except KeyError:
+            encoded = self._encoded_types[key] = _encode_type(value)
+            return encoded
+
+    def _visit_all(self, items: t.Sequence[t.Any]) -> t.List[t.Any]:
+        # most fields and links have no options and directives, so a shared
+        # empty list is returned for them, printer never mutates it
+        return [self.visit(item) for item in items] if items else _EMPTY
+
     def export_record(
         self, type_name: str, obj: t.Type[Record]
     ) -> ast.ObjectTypeDefinitionNode:
         def new_field(name: str, type_: t.Any) -> ast.FieldDefinitionNode:
             return ast.FieldDefinitionNode(
                 name=_name(name),
-                type=_encode_type(type_),
+                type=self._encode_type(type_),
             )
         fields = [new_field(f_name, field)
                   for f_name, field in obj.__field_types__.items()]
@@ -150,61 +219,70 @@ class Exporter(GraphVisitor):
 
     def visit_graph(self, obj: Graph) -> List[ast.DefinitionNode]:
         """List of ObjectTypeDefinitionNode and ObjectTypeExtensionNode"""
+        def skip(node: Node) -> bool:
+            if node.name is None:
+                # check if it is a Root node from introspection
+                return '__schema' in node.fields_map
+
+            return node.name.startswith('__')
+
         return [
             self.get_any_type(),
             *[self.export_record(type_name, type_)
               for type_name, type_ in obj.data_types.items()],
-            *[self.visit(item) for item in obj.items]
+            *[self.visit(item) for item in obj.items if not skip(item)]
         ]
 
     def get_any_type(self) -> ast.ScalarTypeDefinitionNode:
-        return ast.ScalarTypeDefinitionNode(name=_name('Any'))
+        return _ANY_TYPE
 
     def visit_root(self, obj: Root) -> ast.ObjectTypeExtensionNode:
         return ast.ObjectTypeExtensionNode(
-            name=_name('Query'),
-            fields=[self.visit(item) for item in obj.fields],
+            name=_NAME_QUERY,
+            fields=[self.visit(item) for item in obj.fields
+                    if item.name not in ('__typename', '_entities')],
         )
 
     def visit_field(self, obj: Field) -> ast.FieldDefinitionNode:
         return ast.FieldDefinitionNode(
             name=_name(obj.name),
-            type=_encode_type(obj.type),
-            arguments=[self.visit(o) for o in obj.options],
-            directives=[self.visit(d) for d in obj.directives]
+            type=self._encode_type(obj.type),
+            arguments=self._visit_all(obj.options),
+            directives=self._visit_all(obj.directives)
         )
 
     def visit_node(self, obj: Node) -> ast.ObjectTypeDefinitionNode:
-        fields = [self.visit(field) for field in obj.fields]
+        fields = [self.visit(field) for field in obj.fields
+                  if field.name != '__typename']
 
         return ast.ObjectTypeDefinitionNode(
             name=_name(obj.name),
             fields=fields,
-            directives=[self.visit(d) for d in obj.directives]
+            directives=self._visit_all(obj.directives)
         )
 
     def visit_link(self, obj: Link) -> ast.FieldDefinitionNode:
         return ast.FieldDefinitionNode(
             name=_name(obj.name),
-            arguments=[self.visit(o) for o in obj.options],
-            type=_encode_type(obj.type),
-            directives=[self.visit(d) for d in obj.directives]
+            arguments=self._visit_all(obj.options),
+            type=self._encode_type(obj.type),
+            directives=self._visit_all(obj.directives)
         )
 
     def visit_option(self, obj: Option) -> ast.InputValueDefinitionNode:
         return ast.InputValueDefinitionNode(
             name=_name(obj.name),
             description=obj.description,
-            type=_encode_type(obj.type),
+            type=self._encode_type(obj.type),
             default_value=_encode_default_value(obj.default),
         )
 
     def visit_key_directive(self, obj: Key) -> ast.DirectiveNode:
         return ast.DirectiveNode(
-            name=_name('key'),
+            name=_NAME_KEY,
             arguments=[
                 ast.ArgumentNode(
-                    name=_name('fields'),
+                    name=_NAME_FIELDS,
                     value=ast.StringValueNode(value=obj.fields),
                 ),
             ],
@@ -212,10 +290,10 @@ class Exporter(GraphVisitor):
 
     def visit_provides_directive(self, obj: Provides) -> ast.DirectiveNode:
         return ast.DirectiveNode(
-            name=_name('provides'),
+            name=_NAME_PROVIDES,
             arguments=[
                 ast.ArgumentNode(
-                    name=_name('fields'),
+                    name=_NAME_FIELDS,
                     value=ast.StringValueNode(value=obj.fields),
                 ),
             ],
@@ -223,70 +301,56 @@ class Exporter(GraphVisitor):
 
     def visit_requires_directive(self, obj: Requires) -> ast.DirectiveNode:
         return ast.DirectiveNode(
-            name=_name('requires'),
+            name=_NAME_REQUIRES,
             arguments=[
                 ast.ArgumentNode(
-                    name=_name('fields'),
+                    name=_NAME_FIELDS,
                     value=ast.StringValueNode(value=obj.fields),
                 ),
             ],
         )
 
     def visit_external_directive(self, obj: External) -> ast.DirectiveNode:
-        return ast.DirectiveNode(name=_name('external'))
+        return _EXTERNAL_DIRECTIVE
 
     def visit_extends_directive(self, obj: Extends) -> ast.DirectiveNode:
-        return ast.DirectiveNode(name=_name('extends'))
+        return _EXTENDS_DIRECTIVE
 
     def visit_deprecated_directive(self, obj: Deprecated) -> ast.DirectiveNode:
         return ast.DirectiveNode(
-            name=_name('deprecated'),
+            name=_NAME_DEPRECATED,
             arguments=[
                 ast.ArgumentNode(
-                    name=_name('reason'),
+                    name=_NAME_REASON,
                     value=ast.StringValueNode(value=obj.reason),
                 ),
             ],
         )
 
 
-def get_ast(graph: Graph) -> ast.DocumentNode:
-    graph = _StripGraph().visit(graph)
-    return ast.DocumentNode(definitions=Exporter().visit(graph))
-
-
-class _StripGraph(GraphTransformer):
-    def visit_root(self, obj: Root) -> Root:
-        def skip(field: t.Union[Field, Link]) -> bool:
-            return field.name in ['__typename', '_entities']
-
-        return Root([self.visit(f) for f in obj.fields if not skip(f)])
-
-    def visit_graph(self, obj: Graph) -> Graph:
-        def skip(node: Node) -> bool:
-            if node.name is None:
-                # check if it is a Root node from introspection
-                return '__schema' in node.fields_map
-
-            return node.name.startswith('__')
-
-        return Graph(
-            [self.visit(node) for node in obj.items if not skip(node)],
-            obj.data_types
-        )
+# graphs are not changed after construction, so exported schema can be
+# reused for every federation SDL request
+_AST_CACHE: t.MutableMapping[Graph, ast.DocumentNode] = (
+    weakref.WeakKeyDictionary()
+)
+_SDL_CACHE: t.MutableMapping[Graph, str] = weakref.WeakKeyDictionary()
+_CACHE_LOCK = threading.Lock()
 
-    def visit_node(self, obj: Node) -> Node:
-        def skip(field: t.Union[Field, Link]) -> bool:
-            return field.name in ['__typename']
 
-        return Node(
-            obj.name,
-            fields=[self.visit(f) for f in obj.fields if not skip(f)],
-            description=obj.description,
-            directives=obj.directives
-        )
+def get_ast(graph: Graph) -> ast.DocumentNode:
+    with _CACHE_LOCK:
+        document = _AST_CACHE.get(graph)
+        if document is None:
+            document = ast.DocumentNode(definitions=Exporter().visit(graph))
+            _AST_CACHE[graph] = document
+    return document
 
 
 def print_sdl(graph: Graph) -> str:
     """Print graphql AST into a string"""
-    return print_ast(get_ast(graph))
+    document = get_ast(graph)
+    with _CACHE_LOCK:
+        sdl = _SDL_CACHE.get(graph)
+        if sdl is None:
+            sdl = _SDL_CACHE[graph] = print_ast(document)
+    return sdl
@@ -1,12 +1,11 @@
-import re
 import json
+import inspect
 import typing as t
 
 from dataclasses import dataclass
 from functools import partial
-from collections import OrderedDict
 
-from ..directives import get_deprecated
+from ..directives import Deprecated, get_deprecated
 from ..graph import (
     Graph,
     Root,
@@ -17,7 +16,7 @@ from ..graph import (
     Nothing,
     NothingType,
 )
-from ..graph import GraphVisitor, GraphTransformer
+from ..graph import GraphVisitor, GraphTransformer, AbstractGraphVisitor
 from ..types import (
     TypeRef,
     String,
@@ -36,7 +35,7 @@ from ..types import (
     FloatMeta,
     BooleanMeta,
 )
-from ..types import Any, RecordMeta, AbstractTypeVisitor
+from ..types import Any, RecordMeta, AbstractTypeVisitor, GenericMeta
 from ..utils import (
     listify,
     cached_property,
@@ -56,23 +55,60 @@ from .types import (
 )
 
 
+# idents are immutable, so the same instances are returned for every type
+_STRING = SCALAR('String')
+_INT = SCALAR('Int')
+_BOOLEAN = SCALAR('Boolean')
+_FLOAT = SCALAR('Float')
+_ANY = SCALAR('Any')
+_SCALARS = (_STRING, _INT, _BOOLEAN, _FLOAT, _ANY)
+
+_NON_NULL_STRING = NON_NULL(_STRING)
+_NON_NULL_INT = NON_NULL(_INT)
+_NON_NULL_BOOLEAN = NON_NULL(_BOOLEAN)
+_NON_NULL_FLOAT = NON_NULL(_FLOAT)
+
+
+class _FrozenSlots:
+    # slots are restored with object.__setattr__, because frozen dataclasses
+    # forbid attribute assignment, same as in dataclass(slots=True)
+    __slots__: t.Tuple[str, ...] = ()
+
+    def __getstate__(self) -> t.List[t.Any]:
+        return [getattr(self, name) for name in self.__slots__]
+
+    def __setstate__(self, state: t.List[t.Any]) -> None:
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+
 @dataclass(frozen=True)
-class Directive:
+class Directive(_FrozenSlots):
     @dataclass(frozen=True)
-    class Argument:
+    class Argument(_FrozenSlots):
+        __slots__ = ('name', 'type_ident', 'description', 'default_value')
+
         name: str
         type_ident: t.Any
         description: str
         default_value: t.Any
 
+    # declared manually, dataclass(slots=True) requires Python 3.10
+    __slots__ = ('name', 'locations', 'description', 'args', 'args_map')
+
     name: str
     locations: t.List[str]
     description: str
     args: t.List[Argument]
 
-    @property
-    def args_map(self) -> OrderedDict:
-        return OrderedDict((arg.name, arg) for arg in self.args)
+    def __post_init__(self) -> None:
+        # frozen dataclass forbids attribute assignment
+        object.__setattr__(self, 'args_map',
+                           {arg.name: arg for arg in self.args})
+
+    if t.TYPE_CHECKING:
+        # not a dataclass field, computed in __post_init__
+        args_map: t.ClassVar[t.Dict[str, Argument]]
 
 
 _BUILTIN_DIRECTIVES = (
@@ -86,7 +122,7 @@ _BUILTIN_DIRECTIVES = (
         args=[
             Directive.Argument(
                 name='if',
-                type_ident=NON_NULL(SCALAR('Boolean')),
+                type_ident=_NON_NULL_BOOLEAN,
                 description='Skipped when true.',
                 default_value=None,
             ),
@@ -102,7 +138,7 @@ _BUILTIN_DIRECTIVES = (
         args=[
             Directive.Argument(
                 name='if',
-                type_ident=NON_NULL(SCALAR('Boolean')),
+                type_ident=_NON_NULL_BOOLEAN,
                 description='Included when true.',
                 default_value=None,
             ),
@@ -115,7 +151,7 @@ _BUILTIN_DIRECTIVES = (
         args=[
             Directive.Argument(
                 name='reason',
-                type_ident=SCALAR('String'),
+                type_ident=_STRING,
                 description='Deprecation reason.',
                 default_value=None,
             ),
@@ -129,7 +165,7 @@ _BUILTIN_DIRECTIVES = (
         args=[
             Directive.Argument(
                 name='ttl',
-                type_ident=NON_NULL(SCALAR('Int')),
+                type_ident=_NON_NULL_INT,
                 description='How long field will live in cache.',
                 default_value=None,
             ),
@@ -139,6 +175,9 @@ _BUILTIN_DIRECTIVES = (
 
 
 def _async_wrapper(func: t.Callable) -> t.Callable:
+    if inspect.iscoroutinefunction(func):
+        return func
+
     async def wrapper(*args: t.Any, **kwargs: t.Any) -> t.Any:
         return func(*args, **kwargs)
     return wrapper
@@ -160,10 +199,78 @@ class SchemaInfo:
         self.data_types = query_graph.data_types
         self.mutation_graph = mutation_graph
         self.directives = directives or ()
+        self._option_defaults: t.Dict[t.Tuple[str, str, str],
+                                      t.Optional[str]] = {}
+
+    def option_default(
+        self, node_name: str, field_name: str, option: Option
+    ) -> t.Optional[str]:
+        """Returns JSON-encoded default value of the option"""
+        key = (node_name, field_name, option.name)
+        try:
+            return self._option_defaults[key]
+        except KeyError:
+            if option.default is Nothing:
+                default = None
+            else:
+                default = json.dumps(option.default)
+            self._option_defaults[key] = default
+            return default
+
+    @cached_property
+    def directives_map(self) -> t.Dict[str, Directive]:
+        return {d.name: d for d in self.directives}
+
+    @cached_property
+    def directive_arg_idents_map(
+        self,
+    ) -> t.Dict[str, t.List[HashedNamedTuple]]:
+        """Idents of the directive arguments, mapped by directive name"""
+        return {d.name: [DirectiveArgIdent(d.name, arg.name) for arg in d.args]
+                for d in self.directives}
+
+    @cached_property
+    def nodes_map(self) -> t.Dict[str, t.Union[Node, Root]]:
+        nodes: t.Dict[str, t.Union[Node, Root]] = {
+            n.name: n for n in self.query_graph.nodes
+        }
+        nodes[QUERY_ROOT_NAME] = self.query_graph.root
+        if self.mutation_graph is not None:
+            nodes[MUTATION_ROOT_NAME] = self.mutation_graph.root
+        return nodes
+
+    @cached_property
+    def field_idents_map(self) -> t.Dict[str, t.List[HashedNamedTuple]]:
+        """Idents of the object type fields, mapped by type name"""
+        idents = {
+            name: [FieldIdent(name, f_name)
+                   for f_name in type_.__field_types__]
+            for name, type_ in self.data_types.items()
+            if isinstance(type_, RecordMeta)
+        }
+        for name, node in self.nodes_map.items():
+            idents[name] = [FieldIdent(name, f.name) for f in node.fields
+                            if not f.name.startswith('_')]
+        return idents
+
+    @cached_property
+    def deprecated_map(self) -> t.Dict[t.Tuple[str, str], Deprecated]:
+        """Deprecated directives, mapped by node and field names"""
+        deprecated = {}
+        for node_name, node in self.nodes_map.items():
+            for field in node.fields:
+                directive = get_deprecated(field)
+                if directive is not None:
+                    deprecated[node_name, field.name] = directive
+        return deprecated
 
     @cached_property
-    def directives_map(self) -> OrderedDict:
-        return OrderedDict((d.name, d) for d in self.directives)
+    def output_type_ident(self) -> 'TypeIdent':
+        return TypeIdent(self.query_graph)
+
+    @cached_property
+    def input_type_ident(self) -> 'TypeIdent':
+        return TypeIdent(self.query_graph, input_mode=True)
 
 
 class TypeIdent(AbstractTypeVisitor):
@@ -175,15 +282,23 @@ class TypeIdent(AbstractTypeVisitor):
     ) -> None:
         self._graph = graph
         self._input_mode = input_mode
+        # types are kept in the cache to not reuse their ids
+        self._idents: t.Dict[int, t.Tuple[GenericMeta, HashedNamedTuple]] = {}
+
+    def visit(self, obj: GenericMeta) -> HashedNamedTuple:
+        entry = self._idents.get(id(obj))
+        if entry is None:
+            entry = self._idents[id(obj)] = (obj, super().visit(obj))
+        return entry[1]
 
     def visit_any(self, obj: AnyMeta) -> HashedNamedTuple:
-        return SCALAR('Any')
+        return _ANY
 
     def visit_mapping(self, obj: MappingMeta) -> HashedNamedTuple:
-        return SCALAR('Any')
+        return _ANY
 
     def visit_record(self, obj: RecordMeta) -> HashedNamedTuple:
-        return SCALAR('Any')
+        return _ANY
 
     def visit_callable(self, obj: CallableMeta) -> t.NoReturn:
         raise TypeError('Not expected here: {!r}'.format(obj))
@@ -204,16 +319,16 @@ class TypeIdent(AbstractTypeVisitor):
             return NON_NULL(OBJECT(obj.__type_name__))
 
     def visit_string(self, obj: StringMeta) -> HashedNamedTuple:
-        return NON_NULL(SCALAR('String'))
+        return _NON_NULL_STRING
 
     def visit_integer(self, obj: IntegerMeta) -> HashedNamedTuple:
-        return NON_NULL(SCALAR('Int'))
+        return _NON_NULL_INT
 
     def visit_float(self, obj: FloatMeta) -> HashedNamedTuple:
-        return NON_NULL(SCALAR('Float'))
+        return _NON_NULL_FLOAT
 
     def visit_boolean(self, obj: BooleanMeta) -> HashedNamedTuple:
-        return NON_NULL(SCALAR('Boolean'))
+        return _NON_NULL_BOOLEAN
 
 
 class UnsupportedGraphQLType(TypeError):
@@ -240,16 +355,27 @@ class TypeValidator(TypeVisitor):
         raise UnsupportedGraphQLType()
 
 
+_F = t.TypeVar('_F', bound=t.Callable)
+
+
+def _without_schema(func: _F) -> _F:
+    """Marks resolver, which doesn't need schema to be passed into it"""
+    func.__without_schema__ = True  # type: ignore[attr-defined]
+    return func
+
+
+@_without_schema
 def not_implemented(*args: t.Any, **kwargs: t.Any) -> t.NoReturn:
     raise NotImplementedError(args, kwargs)
 
 
-def na_maybe(schema: SchemaInfo) -> NothingType:
+@_without_schema
+def na_maybe() -> NothingType:
     return Nothing
 
 
+@_without_schema
 def na_many(
-    schema: SchemaInfo,
     ids: t.Optional[t.List] = None,
     options: t.Optional[t.Any] = None
 ) -> t.List[t.List]:
@@ -259,14 +385,6 @@ def na_many(
         return [[] for _ in ids]
 
 
-def _nodes_map(schema: SchemaInfo) -> OrderedDict:
-    nodes = [(n.name, n) for n in schema.query_graph.nodes]
-    nodes.append((QUERY_ROOT_NAME, schema.query_graph.root))
-    if schema.mutation_graph is not None:
-        nodes.append((MUTATION_ROOT_NAME, schema.mutation_graph.root))
-    return OrderedDict(nodes)
-
-
 def schema_link(schema: SchemaInfo) -> None:
     return None
 
@@ -275,7 +393,7 @@ def type_link(
     schema: SchemaInfo, options: t.Dict
 ) -> t.Union[HashedNamedTuple, NothingType]:
     name = options['name']
-    if name in _nodes_map(schema):
+    if name in schema.nodes_map:
         return OBJECT(name)
     else:
         return Nothing
@@ -283,13 +401,9 @@ def type_link(
 
 @listify
 def root_schema_types(schema: SchemaInfo) -> t.Iterator[HashedNamedTuple]:
-    yield SCALAR('String')
-    yield SCALAR('Int')
-    yield SCALAR('Boolean')
-    yield SCALAR('Float')
-    yield SCALAR('Any')
+    yield from _SCALARS
 
-    for name in _nodes_map(schema):
+    for name in schema.nodes_map:
         yield OBJECT(name)
     for name, type_ in schema.data_types.items():
         if isinstance(type_, RecordMeta):
@@ -316,224 +430,235 @@ def root_schema_directives(schema: SchemaInfo) -> t.List[HashedNamedTuple]:
     ]
 
 
-@listify
+def _field_indices(fields: t.List[Field], names: t.Tuple) -> t.List[int]:
+    """Positions of the requested fields in the resolver rows"""
+    return [names.index(f.name) for f in fields]
+
+
+_TYPE_INFO_FIELDS = ('id', 'kind', 'name', 'description')
+
+
+def _object_info(ident: t.Any, nodes_map: t.Dict) -> t.Tuple:
+    if ident.name in nodes_map:
+        description = nodes_map[ident.name].description
+    else:
+        description = None
+    return ident, 'OBJECT', ident.name, description
+
+
+def _input_object_info(ident: t.Any, nodes_map: t.Dict) -> t.Tuple:
+    return ident, 'INPUT_OBJECT', 'IO{}'.format(ident.name), None
+
+
+def _non_null_info(ident: t.Any, nodes_map: t.Dict) -> t.Tuple:
+    return ident, 'NON_NULL', None, None
+
+
+def _list_info(ident: t.Any, nodes_map: t.Dict) -> t.Tuple:
+    return ident, 'LIST', None, None
+
+
+def _scalar_info(ident: t.Any, nodes_map: t.Dict) -> t.Tuple:
+    return ident, 'SCALAR', ident.name, None
+
+
+_TYPE_INFO = {
+    OBJECT: _object_info,
+    INPUT_OBJECT: _input_object_info,
+    NON_NULL: _non_null_info,
+    LIST: _list_info,
+    SCALAR: _scalar_info,
+}
+
+
 def type_info(
     schema: SchemaInfo,
     fields: t.List[Field],
     ids: t.List
-) -> t.Iterator[t.List[t.Optional[t.Dict]]]:
-    nodes_map = _nodes_map(schema)
+) -> t.List[t.List[t.Any]]:
+    nodes_map = schema.nodes_map
+    indices = _field_indices(fields, _TYPE_INFO_FIELDS)
+    result = []
     for ident in ids:
-        if isinstance(ident, OBJECT):
-            if ident.name in nodes_map:
-                description = nodes_map[ident.name].description
-            else:
-                description = None
-            info = {'id': ident,
-                    'kind': 'OBJECT',
-                    'name': ident.name,
-                    'description': description}
-        elif isinstance(ident, INPUT_OBJECT):
-            info = {'id': ident,
-                    'kind': 'INPUT_OBJECT',
-                    'name': 'IO{}'.format(ident.name),
-                    'description': None}
-        elif isinstance(ident, NON_NULL):
-            info = {'id': ident,
-                    'kind': 'NON_NULL'}
-        elif isinstance(ident, LIST):
-            info = {'id': ident,
-                    'kind': 'LIST'}
-        elif isinstance(ident, SCALAR):
-            info = {'id': ident,
-                    'name': ident.name,
-                    'kind': 'SCALAR'}
-        else:
+        get_info = _TYPE_INFO.get(ident.__class__)
+        if get_info is None:
             raise TypeError(repr(ident))
-        yield [info.get(f.name) for f in fields]
+        row = get_info(ident, nodes_map)
+        result.append([row[i] for i in indices])
+    return result
 
 
-@listify
 def type_fields_link(
     schema: SchemaInfo,
     ids: t.List,
     options: t.List
-) -> t.Iterator[t.List[HashedNamedTuple]]:
-    nodes_map = _nodes_map(schema)
+) -> t.List[t.List[HashedNamedTuple]]:
+    field_idents_map = schema.field_idents_map
+    result = []
     for ident in ids:
         if isinstance(ident, OBJECT):
-            if ident.name in nodes_map:
-                node = nodes_map[ident.name]
-                field_idents = [
-                    FieldIdent(ident.name, f.name)
-                    for f in node.fields if not f.name.startswith('_')
-                ]
-            else:
-                type_ = schema.data_types[ident.name]
-                field_idents = [
-                    FieldIdent(ident.name, f_name)
-                    for f_name, f_type in type_.__field_types__.items()
-                ]
+            field_idents = field_idents_map[ident.name]
             if not field_idents:
                 raise TypeError('Object type "{}" does not contain fields, '
                                 'which is not acceptable for GraphQL in order '
                                 'to define schema type'.format(ident.name))
-            yield field_idents
+            result.append(field_idents)
         else:
-            yield []
+            result.append([])
+    return result
 
 
-@listify
 def type_of_type_link(
     schema: SchemaInfo,
     ids: t.List
-) -> t.Iterator[t.Union[HashedNamedTuple, NothingType]]:
+) -> t.List[t.Union[HashedNamedTuple, NothingType]]:
+    result = []
     for ident in ids:
         if isinstance(ident, (NON_NULL, LIST)):
-            yield ident.of_type
+            result.append(ident.of_type)
         else:
-            yield Nothing
+            result.append(Nothing)
+    return result
+
+
+_FIELD_INFO_FIELDS = ('id', 'name', 'description', 'isDeprecated',
+                      'deprecationReason')
 
 
-@listify
 def field_info(
     schema: SchemaInfo,
     fields: t.List[Field],
     ids: t.List
-) -> t.Iterator[t.List[t.Dict]]:
-    nodes_map = _nodes_map(schema)
+) -> t.List[t.List[t.Any]]:
+    nodes_map = schema.nodes_map
+    deprecated_map = schema.deprecated_map
+    indices = _field_indices(fields, _FIELD_INFO_FIELDS)
+    result = []
     for ident in ids:
         if ident.node in nodes_map:
             node = nodes_map[ident.node]
             field = node.fields_map[ident.name]
-            deprecated = None
-            if isinstance(field, (Field, Link)):
-                deprecated = get_deprecated(field)
-
-            info = {'id': ident,
-                    'name': field.name,
-                    'description': field.description,
-                    'isDeprecated': bool(deprecated),
-                    'deprecationReason': deprecated and deprecated.reason}
+            deprecated = deprecated_map.get((ident.node, ident.name))
+            row = (ident, field.name, field.description, bool(deprecated),
+                   deprecated and deprecated.reason)
         else:
-            info = {'id': ident,
-                    'name': ident.name,
-                    'description': None,
-                    'isDeprecated': False,
-                    'deprecationReason': None}
-        yield [info[f.name] for f in fields]
+            row = (ident, ident.name, None, False, None)
+        result.append([row[i] for i in indices])
+    return result
 
 
-@listify
 def field_type_link(
     schema: SchemaInfo,
     ids: t.List
-) -> t.Iterator[HashedNamedTuple]:
-    nodes_map = _nodes_map(schema)
-    type_ident = TypeIdent(schema.query_graph)
+) -> t.List[HashedNamedTuple]:
+    nodes_map = schema.nodes_map
+    type_ident = schema.output_type_ident
+    result = []
     for ident in ids:
         if ident.node in nodes_map:
             node = nodes_map[ident.node]
             field = node.fields_map[ident.name]
-            yield type_ident.visit(field.type or Any)
+            result.append(type_ident.visit(field.type or Any))
         else:
             data_type = schema.data_types[ident.node]
             field_type = data_type.__field_types__[ident.name]
-            yield type_ident.visit(field_type)
+            result.append(type_ident.visit(field_type))
+    return result
 
 
-@listify
 def field_args_link(
     schema: SchemaInfo,
     ids: t.List
-) -> t.Iterator[t.List[HashedNamedTuple]]:
-    nodes_map = _nodes_map(schema)
+) -> t.List[t.List[HashedNamedTuple]]:
+    nodes_map = schema.nodes_map
+    result = []
     for ident in ids:
         if ident.node in nodes_map:
             node = nodes_map[ident.node]
             field = node.fields_map[ident.name]
-            yield [FieldArgIdent(ident.node, field.name, option.name)
-                   for option in field.options]
+            result.append([FieldArgIdent(ident.node, field.name, option.name)
+                           for option in field.options])
         else:
-            yield []
+            result.append([])
+    return result
 
 
-@listify
 def type_input_object_input_fields_link(
     schema: SchemaInfo,
     ids: t.List
-) -> t.Iterator[t.List[HashedNamedTuple]]:
+) -> t.List[t.List[HashedNamedTuple]]:
+    result = []
     for ident in ids:
         if isinstance(ident, INPUT_OBJECT):
             data_type = schema.data_types[ident.name]
-            yield [InputObjectFieldIdent(ident.name, key)
-                   for key in data_type.__field_types__.keys()]
+            result.append([InputObjectFieldIdent(ident.name, key)
+                           for key in data_type.__field_types__.keys()])
         else:
-            yield []
+            result.append([])
+    return result
+
+
+_INPUT_VALUE_INFO_FIELDS = ('id', 'name', 'description', 'defaultValue')
 
 
-@listify
 def input_value_info(
     schema: SchemaInfo,
     fields: t.List[Field],
     ids: t.List
-) -> t.Iterator[t.List[t.Dict]]:
-    nodes_map = _nodes_map(schema)
+) -> t.List[t.List[t.Any]]:
+    nodes_map = schema.nodes_map
+    indices = _field_indices(fields, _INPUT_VALUE_INFO_FIELDS)
+    with_default = _INPUT_VALUE_INFO_FIELDS.index('defaultValue') in indices
+    result = []
     for ident in ids:
         if isinstance(ident, FieldArgIdent):
             node = nodes_map[ident.node]
             field = node.fields_map[ident.field]
             option = field.options_map[ident.name]
-            if option.default is Nothing:
-                default = None
+            if with_default:
+                default = schema.option_default(ident.node, ident.field,
+                                                option)
             else:
-                default = json.dumps(option.default)
-            info = {'id': ident,
-                    'name': option.name,
-                    'description': option.description,
-                    'defaultValue': default}
-            yield [info[f.name] for f in fields]
+                default = None
+            row = (ident, option.name, option.description, default)
         elif isinstance(ident, InputObjectFieldIdent):
-            info = {'id': ident,
-                    'name': ident.key,
-                    'description': None,
-                    'defaultValue': None}
-            yield [info[f.name] for f in fields]
+            row = (ident, ident.key, None, None)
         elif isinstance(ident, DirectiveArgIdent):
             directive = schema.directives_map[ident.name]
             arg = directive.args_map[ident.arg]
-            info = {'id': ident,
-                    'name': arg.name,
-                    'description': arg.description,
-                    'defaultValue': arg.default_value}
-            yield [info[f.name] for f in fields]
+            row = (ident, arg.name, arg.description, arg.default_value)
         else:
             raise TypeError(repr(ident))
+        result.append([row[i] for i in indices])
+    return result
 
 
-@listify
 def input_value_type_link(
     schema: SchemaInfo,
     ids: t.List
-) -> t.Iterator[HashedNamedTuple]:
-    nodes_map = _nodes_map(schema)
-    type_ident = TypeIdent(schema.query_graph, input_mode=True)
+) -> t.List[HashedNamedTuple]:
+    nodes_map = schema.nodes_map
+    type_ident = schema.input_type_ident
+    result = []
     for ident in ids:
         if isinstance(ident, FieldArgIdent):
             node = nodes_map[ident.node]
             field = node.fields_map[ident.field]
             option = field.options_map[ident.name]
-            yield type_ident.visit(option.type)
+            result.append(type_ident.visit(option.type))
         elif isinstance(ident, InputObjectFieldIdent):
             data_type = schema.data_types[ident.name]
             field_type = data_type.__field_types__[ident.key]
-            yield type_ident.visit(field_type)
+            result.append(type_ident.visit(field_type))
         elif isinstance(ident, DirectiveArgIdent):
             directive = schema.directives_map[ident.name]
-            for arg in directive.args:
-                yield arg.type_ident
+            result.append(directive.args_map[ident.arg].type_ident)
         else:
             raise TypeError(repr(ident))
+    return result
+
+
+_DIRECTIVE_INFO_FIELDS = ('name', 'description', 'locations')
 
 
 @listify
@@ -542,25 +667,20 @@ def directive_value_info(
     fields: t.List[Field],
     ids: t.List
 ) -> t.Iterator[t.List[Any]]:
+    indices = _field_indices(fields, _DIRECTIVE_INFO_FIELDS)
     for ident in ids:
         if ident.name in schema.directives_map:
             directive = schema.directives_map[ident.name]
-            info = {'name': directive.name,
-                    'description': directive.description,
-                    'locations': directive.locations}
-            yield [info[f.name] for f in fields]
+            row = (directive.name, directive.description, directive.locations)
+            yield [row[i] for i in indices]
 
 
 def directive_args_link(
     schema: SchemaInfo,
     ids: t.List
 ) -> t.List[t.List[HashedNamedTuple]]:
-    links = []
-    for ident in ids:
-        directive = schema.directives_map[ident]
-        links.append([DirectiveArgIdent(ident, arg.name)
-                      for arg in directive.args])
-    return links
+    arg_idents_map = schema.directive_arg_idents_map
+    return [arg_idents_map[ident] for ident in ids]
 
 
 GRAPH = Graph([
@@ -647,64 +767,85 @@ GRAPH = Graph([
 ])
 
 
-class ValidateGraph(GraphVisitor):
-    _name_re = re.compile(r'^[_a-zA-Z]\w*$', re.ASCII)
+def _is_valid_name(name: str) -> bool:
+    """Checks that name matches ``[_a-zA-Z][_a-zA-Z0-9]*`` pattern"""
+    return name.isascii() and name.isidentifier()
 
-    def __init__(self) -> None:
-        self._path: t.List[str] = []
-        self._errors: t.List[str] = []
+
+class ValidateGraphMixin(AbstractGraphVisitor):
+    """Collects GraphQL-specific errors while graph is visited
+
+    Can be combined with :py:class:`~hiku.graph.GraphVisitor` or
+    :py:class:`~hiku.graph.GraphTransformer` to validate graph and process
+    it in a single traversal.
+    """
+    _path: t.List[str]
+    _errors: t.List[str]
+
+    def _reset_errors(self) -> None:
+        self._path = []
+        self._errors = []
 
     def _add_error(self, name: str, description: str) -> None:
         path = '.'.join(self._path + [name])
         self._errors.append('{}: {}'.format(path, description))
 
-    @classmethod
-    def validate(cls, graph: Graph) -> None:
-        self = cls()
-        self.visit(graph)
+    def _raise_errors(self) -> None:
         if self._errors:
             raise ValueError('Invalid GraphQL graph:\n{}'
                              .format('\n'.join('- {}'.format(err)
                                                for err in self._errors)))
 
-    def visit_node(self, obj: Node) -> None:
+    def visit_node(self, obj: Node) -> t.Any:
         assert obj.name is not None
-        if not self._name_re.match(obj.name):
+        if not _is_valid_name(obj.name):
             self._add_error(obj.name,
                             'Invalid node name: {}'.format(obj.name))
-        if obj.fields:
-            self._path.append(obj.name)
-            super(ValidateGraph, self).visit_node(obj)
-            self._path.pop()
-        else:
+        if not obj.fields:
             self._add_error(obj.name,
                             'No fields in the {} node'.format(obj.name))
+        self._path.append(obj.name)
+        result = super(ValidateGraphMixin, self).visit_node(obj)
+        self._path.pop()
+        return result
 
-    def visit_root(self, obj: Root) -> None:
-        if obj.fields:
-            self._path.append('Root')
-            super(ValidateGraph, self).visit_root(obj)
-            self._path.pop()
-        else:
+    def visit_root(self, obj: Root) -> t.Any:
+        if not obj.fields:
             self._add_error('Root', 'No fields in the Root node')
+        self._path.append('Root')
+        result = super(ValidateGraphMixin, self).visit_root(obj)
+        self._path.pop()
+        return result
 
-    def visit_field(self, obj: Field) -> None:
-        if not self._name_re.match(obj.name):
+    def visit_field(self, obj: Field) -> t.Any:
+        if not _is_valid_name(obj.name):
             self._add_error(obj.name,
                             'Invalid field name: {}'.format(obj.name))
-        super(ValidateGraph, self).visit_field(obj)
+        return super(ValidateGraphMixin, self).visit_field(obj)
 
-    def visit_link(self, obj: Link) -> None:
-        if not self._name_re.match(obj.name):
+    def visit_link(self, obj: Link) -> t.Any:
+        if not _is_valid_name(obj.name):
             self._add_error(obj.name,
                             'Invalid link name: {}'.format(obj.name))
-        super(ValidateGraph, self).visit_link(obj)
+        return super(ValidateGraphMixin, self).visit_link(obj)
 
-    def visit_option(self, obj: Option) -> None:
-        if not self._name_re.match(obj.name):
+    def visit_option(self, obj: Option) -> t.Any:
+        if not _is_valid_name(obj.name):
             self._add_error(obj.name,
                             'Invalid option name: {}'.format(obj.name))
-        super(ValidateGraph, self).visit_option(obj)
+        return super(ValidateGraphMixin, self).visit_option(obj)
+
+
+class ValidateGraph(ValidateGraphMixin, GraphVisitor):
+
+    def __init__(self) -> None:
+        self._reset_errors()
+
+    @classmethod
+    def validate(cls, graph: Graph) -> None:
+        self = cls()
+        self.visit(graph)
+        self._raise_errors()
 
 
 class BindToSchema(GraphTransformer):
@@ -713,17 +854,22 @@ class BindToSchema(GraphTransformer):
         self.schema = schema
         self._processed: t.Dict = {}
 
+    def _bind(self, func: t.Callable) -> t.Callable:
+        if getattr(func, '__without_schema__', False):
+            return func
+        bound = self._processed.get(func)
+        if bound is None:
+            bound = self._processed[func] = partial(func, self.schema)
+        return bound
+
     def visit_field(self, obj: Field) -> Field:
         field = super(BindToSchema, self).visit_field(obj)
-        func = self._processed.get(obj.func)
-        if func is None:
-            func = self._processed[obj.func] = partial(obj.func, self.schema)
-        field.func = func
+        field.func = self._bind(obj.func)
         return field
 
     def visit_link(self, obj: Link) -> Link:
         link = super(BindToSchema, self).visit_link(obj)
-        link.func = partial(link.func, self.schema)
+        link.func = self._bind(link.func)
         return link
 
 
@@ -732,17 +878,20 @@ class MakeAsync(GraphTransformer):
     def __init__(self) -> None:
         self._processed: t.Dict = {}
 
+    def _wrap(self, func: t.Callable) -> t.Callable:
+        wrapper = self._processed.get(func)
+        if wrapper is None:
+            wrapper = self._processed[func] = _async_wrapper(func)
+        return wrapper
+
     def visit_field(self, obj: Field) -> Field:
         field = super(MakeAsync, self).visit_field(obj)
-        func = self._processed.get(obj.func)
-        if func is None:
-            func = self._processed[obj.func] = _async_wrapper(obj.func)
-        field.func = func
+        field.func = self._wrap(obj.func)
         return field
 
     def visit_link(self, obj: Link) -> Link:
         link = super(MakeAsync, self).visit_link(obj)
-        link.func = _async_wrapper(link.func)
+        link.func = self._wrap(link.func)
         return link
 
 
@@ -751,7 +900,11 @@ def type_name_field_func(
     fields: t.List[Field],
     ids: t.Optional[t.List] = None
 ) -> t.List:
-    return [[node_name] for _ in ids] if ids is not None else [node_name]
+    row = [node_name]
+    if ids is None:
+        return row
+    # engine only reads result rows, so the same row can be shared by all ids
+    return [row] * len(ids)
 
 
 class AddIntrospection(GraphTransformer):
@@ -780,7 +933,7 @@ class AddIntrospection(GraphTransformer):
         return graph
 
 
-class GraphQLIntrospection(GraphTransformer):
+class GraphQLIntrospection(ValidateGraphMixin, GraphTransformer):
     """Adds GraphQL introspection into synchronous graph
 
     Example:
@@ -819,6 +972,12 @@ class GraphQLIntrospection(GraphTransformer):
     def __introspection_graph__(self) -> Graph:
         return BindToSchema(self._schema).visit(GRAPH)
 
+    @cached_property
+    def _introspection_graph(self) -> Graph:
+        # introspection graph depends only on the schema, so it is built
+        # once and reused every time this transformer is applied
+        return self.__introspection_graph__()
+
     def visit_node(self, obj: Node) -> Node:
         node = super(GraphQLIntrospection, self).visit_node(obj)
         node.fields.append(self.__type_name__(obj.name))
@@ -830,10 +989,11 @@ class GraphQLIntrospection(GraphTransformer):
         return root
 
     def visit_graph(self, obj: Graph) -> Graph:
-        ValidateGraph.validate(obj)
-        introspection_graph = self.__introspection_graph__()
+        # graph is validated while it is transformed
+        self._reset_errors()
         items = [self.visit(node) for node in obj.items]
-        items.extend(introspection_graph.items)
+        self._raise_errors()
+        items.extend(self._introspection_graph.items)
         return Graph(items, data_types=obj.data_types)
 
 
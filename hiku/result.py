@@ -89,28 +89,31 @@ class Proxy:
             raise KeyError("Field {!r} wasn't requested in the query"
                            .format(item))
 
+        idx = self.__idx__
+        ref = self.__ref__
         try:
-            obj: t.Dict = self.__idx__[self.__ref__.node][self.__ref__.ident]
+            obj: t.Dict = idx[ref.node][ref.ident]
         except KeyError:
             raise AssertionError('Object {}[{!r}] is missing in the index'
-                                 .format(self.__ref__.node, self.__ref__.ident))
+                                 .format(ref.node, ref.ident))
         try:
             value: t.Any = obj[field.index_key]
         except KeyError:
             raise AssertionError('Field {}[{!r}].{} is missing in the index'
-                                 .format(self.__ref__.node, self.__ref__.ident,
+                                 .format(ref.node, ref.ident,
                                          field.index_key))
 
         if isinstance(field, Field):
             return value
         elif isinstance(value, Reference):
-            return self.__class__(self.__idx__, value, field.node)
+            return self.__class__(idx, value, field.node)
         elif (
             isinstance(value, list) and value
             and isinstance(value[0], Reference)
         ):
-            return [self.__class__(self.__idx__, ref, field.node)
-                    for ref in value]
+            node = field.node
+            cls = self.__class__
+            return [cls(idx, item, node) for item in value]
         else:
             return value
 
@@ -2,6 +2,7 @@ from ..types import TypingMeta
 
 
 class TypeDefMeta(TypingMeta):
+    __type_attrs__ = ('__type_name__', '__type__')
 
     def __cls_init__(cls, params):
         cls.__type_name__, cls.__type__ = params
@@ -1,20 +1,50 @@
 import typing as t
+import threading
+import weakref
 
 from abc import abstractmethod, ABC
-from collections import OrderedDict
+from collections import abc as collections_abc
+
+
+# attributes, which are cached in types and are not a part of the type
+_CACHED_ATTRS = frozenset(['__type_hash__', '__type_repr__',
+                           '__type_interned__'])
+
+
+def _type_dict(cls: type) -> t.Dict[str, t.Any]:
+    return {key: value for key, value in cls.__dict__.items()
+            if key not in _CACHED_ATTRS}
 
 
 class GenericMeta(type):
+    #: attributes, which are set by type parameters and are compared to check
+    #: types equality, if not declared, types are compared by all their
+    #: attributes
+    __type_attrs__: t.Optional[t.Tuple[str, ...]] = None
 
     def __repr__(cls) -> str:
         return cls.__name__
 
     def __eq__(cls, other: t.Any) -> bool:
-        return (cls.__class__ is other.__class__
-                and cls.__dict__ == other.__dict__)
+        if cls is other:
+            return True
+        if (
+            cls.__class__ is not other.__class__
+            or cls.__name__ != other.__name__
+            or getattr(cls, '__final__', False)
+            != getattr(other, '__final__', False)
+        ):
+            return False
+        if cls.__type_attrs__ is None:
+            return _type_dict(cls) == _type_dict(other)
+        for attr in cls.__type_attrs__:
+            if getattr(cls, attr, None) != getattr(other, attr, None):
+                return False
+        return True
 
     def __ne__(cls, other: t.Any) -> bool:
-        return not cls.__eq__(other)
+        # cls.__eq__ would be looked up in the class itself, not in metaclass
+        return not cls == other
 
     def __hash__(self) -> int:
         return hash(self.__name__)
@@ -76,8 +106,53 @@ class Float(metaclass=FloatMeta):
 TM = t.TypeVar('TM', bound='TypingMeta')
 
 
+def _freeze(parameters: t.Any) -> t.Hashable:
+    if isinstance(parameters, str):
+        return parameters
+    elif isinstance(parameters, GenericMeta):
+        # types, which are not reused, are equal to other types with the
+        # same parameters, but they must not be replaced by them
+        if (
+            getattr(parameters, '__final__', False)
+            and not parameters.__dict__.get('__type_interned__', False)
+        ):
+            raise TypeError(parameters)
+        return parameters
+    elif isinstance(parameters, (list, tuple)):
+        return tuple(_freeze(p) for p in parameters)
+    elif isinstance(parameters, dict):
+        return tuple((key, _freeze(val)) for key, val in parameters.items())
+    else:
+        raise TypeError(parameters)
+
+
+def _type_attr_hash(value: t.Any) -> int:
+    try:
+        if isinstance(value, dict):
+            # dicts are compared regardless of the keys order
+            return hash(frozenset(value.items()))
+        elif isinstance(value, list):
+            return hash(tuple(value))
+        return hash(value)
+    except TypeError:
+        # unhashable parameters of the custom types are only compared
+        return 0
+
+
+# parameterized types are immutable, so the same type object can be
+# returned when the same parameters are substituted again
+_TYPES: t.MutableMapping[t.Tuple, 'TypingMeta'] = \
+    weakref.WeakValueDictionary()
+# reentrant, because parameters are substituted recursively, when
+# TypeRef types are created for names
+_TYPES_LOCK = threading.RLock()
+
+
 class TypingMeta(GenericMeta, type):
     __final__ = False
+    __type_hash__: int
+    __type_interned__: bool
+    _interned = True
 
     def __cls_init__(cls: TM, parameters: t.Any) -> None:
         raise NotImplementedError(type(cls))
@@ -85,25 +160,59 @@ class TypingMeta(GenericMeta, type):
     def __cls_repr__(cls: TM) -> str:
         raise NotImplementedError(type(cls))
 
-    def __getitem__(cls: TM, parameters: t.Any) -> TM:
-        if cls.__final__:
-            raise TypeError('Cannot substitute parameters in {!r}'.format(cls))
+    def _parameterize(cls: TM, parameters: t.Any) -> TM:
         type_ = cls.__class__(cls.__name__, cls.__bases__, dict(cls.__dict__))
         type_.__cls_init__(parameters)
         type_.__final__ = True
+        # parameters are not changing after substitution, so hash is
+        # computed once and distinguishes types with different parameters
+        type_.__type_hash__ = hash((type_.__name__, *(
+            _type_attr_hash(getattr(type_, attr, None))
+            for attr in type_.__type_attrs__ or ()
+        )))
         return type_
 
+    def __getitem__(cls: TM, parameters: t.Any) -> TM:
+        if cls.__final__:
+            raise TypeError('Cannot substitute parameters in {!r}'.format(cls))
+        if not cls._interned:
+            return cls._parameterize(parameters)
+        try:
+            key = (cls, _freeze(parameters))
+        except TypeError:
+            # parameters of unknown kind, or one-shot iterables
+            return cls._parameterize(parameters)
+        # lookups of already created types don't need the lock
+        type_ = _TYPES.get(key)
+        if type_ is None:
+            with _TYPES_LOCK:
+                type_ = _TYPES.get(key)
+                if type_ is None:
+                    type_ = cls._parameterize(parameters)
+                    type_.__type_interned__ = True
+                    _TYPES[key] = type_
+        return t.cast(TM, type_)
+
     def __repr__(self) -> str:
         if self.__final__:
-            return self.__cls_repr__()
+            # parameters are not changing after substitution, so repr is
+            # computed once, own type's __dict__ is checked to not reuse
+            # repr of the base type in subclasses
+            type_repr = self.__dict__.get('__type_repr__')
+            if type_repr is None:
+                type_repr = self.__type_repr__ = self.__cls_repr__()
+            return t.cast(str, type_repr)
         else:
             return super(TypingMeta, self).__repr__()
 
     def __hash__(self) -> int:
+        if self.__final__:
+            return self.__type_hash__
         return hash(self.__name__)
 
 
 class OptionalMeta(TypingMeta):
+    __type_attrs__ = ('__type__',)
     __type__: GenericMeta
 
     def __cls_init__(cls, type_: GenericMeta) -> None:
@@ -121,6 +230,7 @@ class Optional(metaclass=OptionalMeta):
 
 
 class SequenceMeta(TypingMeta):
+    __type_attrs__ = ('__item_type__',)
     __item_type__: GenericMeta
 
     def __cls_init__(cls, item_type: GenericMeta) -> None:
@@ -138,6 +248,7 @@ class Sequence(metaclass=SequenceMeta):
 
 
 class MappingMeta(TypingMeta):
+    __type_attrs__ = ('__key_type__', '__value_type__')
     __key_type__: GenericMeta
     __value_type__: GenericMeta
 
@@ -159,7 +270,12 @@ class Mapping(metaclass=MappingMeta):
 
 
 class RecordMeta(TypingMeta):
-    __field_types__: OrderedDict
+    __type_attrs__ = ('__field_types__',)
+    __field_types__: t.Dict[str, GenericMeta]
+    __field_values__: t.Tuple[GenericMeta, ...]
+    # records are used as node types, and nodes with the same fields must
+    # still have distinct types
+    _interned = False
 
     def __cls_init__(
         cls,
@@ -168,31 +284,34 @@ class RecordMeta(TypingMeta):
             t.List[t.Tuple[str, GenericMeta]]
         ]
     ) -> None:
-        items: t.Iterable
-        if hasattr(field_types, 'items'):
-            field_types = t.cast(t.Dict[str, GenericMeta], field_types)
-            items = list(field_types.items())
+        items: t.Iterable[t.Tuple[str, GenericMeta]]
+        if isinstance(field_types, collections_abc.Mapping):
+            items = field_types.items()
         else:
-            items = list(field_types)
-        cls.__field_types__ = OrderedDict(
-            (key, _maybe_typeref(val)) for key, val in items
-        )
+            items = field_types
+        cls.__field_types__ = {
+            key: _maybe_typeref(val) for key, val in items
+        }
+        cls.__field_values__ = tuple(cls.__field_types__.values())
 
     def __cls_repr__(self) -> str:
-        return '{}[{!r}]'.format(self.__name__, dict(self.__field_types__))
+        return '{}[{!r}]'.format(self.__name__, self.__field_types__)
 
     def accept(cls, visitor: 'AbstractTypeVisitor') -> t.Any:
         return visitor.visit_record(cls)
 
 
 class Record(metaclass=RecordMeta):
-    __field_types__: OrderedDict
+    __field_types__: t.Dict[str, GenericMeta]
+    __field_values__: t.Tuple[GenericMeta, ...]
 
 
 class CallableMeta(TypingMeta):
+    __type_attrs__ = ('__arg_types__',)
+    __arg_types__: t.Tuple[GenericMeta, ...]
 
     def __cls_init__(cls, arg_types: t.Iterable[GenericMeta]) -> None:
-        cls.__arg_types__ = [_maybe_typeref(typ) for typ in arg_types]
+        cls.__arg_types__ = tuple(_maybe_typeref(typ) for typ in arg_types)
 
     def __cls_repr__(self) -> str:
         return '{}[{}]'.format(self.__name__,
@@ -207,6 +326,7 @@ class Callable(metaclass=CallableMeta):
 
 
 class TypeRefMeta(TypingMeta):
+    __type_attrs__ = ('__type_name__',)
     __type_name__: str
 
     def __cls_init__(cls, *args: str) -> None:
@@ -225,6 +345,11 @@ class TypeRef(metaclass=TypeRefMeta):
     ...
 
 
+# type references by name, a shortcut for the generic parameterized types
+# cache, because references by name are the most common type parameters
+_TYPE_REFS: t.Dict[str, TypeRefMeta] = {}
+
+
 @t.overload
 def _maybe_typeref(typ: str) -> TypeRefMeta:
     ...
@@ -236,13 +361,45 @@ def _maybe_typeref(typ: GenericMeta) -> GenericMeta:
 
 
 def _maybe_typeref(typ: t.Union[str, GenericMeta]) -> GenericMeta:
-    return TypeRef[typ] if isinstance(typ, str) else typ
+    if isinstance(typ, str):
+        type_ref = _TYPE_REFS.get(typ)
+        if type_ref is None:
+            type_ref = _TYPE_REFS.setdefault(typ, TypeRef[typ])
+        return type_ref
+    return typ
+
+
+# builtin types are dispatched directly to the visitor methods, without
+# calling accept method of the type
+_VISIT_METHODS = {
+    AnyMeta: 'visit_any',
+    BooleanMeta: 'visit_boolean',
+    StringMeta: 'visit_string',
+    IntegerMeta: 'visit_integer',
+    FloatMeta: 'visit_float',
+    TypeRefMeta: 'visit_typeref',
+    OptionalMeta: 'visit_optional',
+    SequenceMeta: 'visit_sequence',
+    MappingMeta: 'visit_mapping',
+    RecordMeta: 'visit_record',
+    CallableMeta: 'visit_callable',
+}
 
 
 class AbstractTypeVisitor(ABC):
+    _dispatch: t.ClassVar[t.Dict[type, t.Callable]] = {}
+
+    def __init_subclass__(cls, **kwargs: t.Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = {meta: getattr(cls, name)
+                         for meta, name in _VISIT_METHODS.items()}
 
     def visit(self, obj: GenericMeta) -> t.Any:
-        return obj.accept(self)
+        func = self._dispatch.get(obj.__class__)
+        if func is None:
+            # custom types are dispatched by their accept method
+            return obj.accept(self)
+        return func(self, obj)
 
     @abstractmethod
     def visit_any(self, obj: AnyMeta) -> t.Any:
@@ -289,7 +446,55 @@ class AbstractTypeVisitor(ABC):
         pass
 
 
+# child types of the container types, which are visited by the default
+# TypeVisitor methods
+_CHILD_TYPES: t.Dict[type, t.Callable[[t.Any], t.Sequence[GenericMeta]]] = {
+    OptionalMeta: lambda obj: (obj.__type__,),
+    SequenceMeta: lambda obj: (obj.__item_type__,),
+    MappingMeta: lambda obj: (obj.__key_type__, obj.__value_type__),
+    RecordMeta: lambda obj: obj.__field_values__,
+    CallableMeta: lambda obj: obj.__arg_types__,
+}
+
+
 class TypeVisitor(AbstractTypeVisitor):
+    """Visits every type nested into the visited type
+
+    Container types are walked without recursion, unless their visit
+    methods are overridden, so subclasses should override ``visit_*``
+    methods instead of the :py:meth:`visit` method.
+    """
+    _walk: t.ClassVar[
+        t.Dict[type, t.Callable[[t.Any], t.Sequence[GenericMeta]]]
+    ] = {}
+
+    def __init_subclass__(cls, **kwargs: t.Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._walk = {
+            meta: children for meta, children in _CHILD_TYPES.items()
+            if cls._dispatch[meta] is getattr(TypeVisitor,
+                                              _VISIT_METHODS[meta])
+        }
+
+    def visit(self, obj: GenericMeta) -> t.Any:
+        walk = self._walk
+        if obj.__class__ not in walk:
+            return super().visit(obj)
+        dispatch = self._dispatch
+        stack = [obj]
+        while stack:
+            obj = stack.pop()
+            meta = obj.__class__
+            children = walk.get(meta)
+            if children is not None:
+                # reversed to visit child types in their original order
+                stack.extend(reversed(children(obj)))
+                continue
+            func = dispatch.get(meta)
+            if func is None:
+                obj.accept(self)
+            else:
+                func(self, obj)
 
     def visit_any(self, obj: AnyMeta) -> t.Any:
         pass
@@ -320,7 +525,7 @@ class TypeVisitor(AbstractTypeVisitor):
         self.visit(obj.__value_type__)
 
     def visit_record(self, obj: RecordMeta) -> t.Any:
-        for value_type in obj.__field_types__.values():
+        for value_type in obj.__field_values__:
             self.visit(value_type)
 
     def visit_callable(self, obj: CallableMeta) -> t.Any:
@@ -74,21 +74,21 @@ class _AssumeRecord(AbstractTypeVisitor):
     visit_mapping = _false
     visit_callable = _false
 
-    def visit_optional(self, obj: OptionalMeta) -> t.Optional[t.OrderedDict]:
+    def visit_optional(self, obj: OptionalMeta) -> t.Optional[t.Dict]:
         if not self._nested:
             return self._get_nested().visit(obj.__type__)
         return None
 
-    def visit_sequence(self, obj: SequenceMeta) -> t.Optional[t.OrderedDict]:
+    def visit_sequence(self, obj: SequenceMeta) -> t.Optional[t.Dict]:
         if not self._nested:
             return self._get_nested().visit(obj.__item_type__)
         return None
 
-    def visit_record(self, obj: RecordMeta) -> t.OrderedDict:
+    def visit_record(self, obj: RecordMeta) -> t.Dict:
         # return fields alongside type definitions
         return obj.__field_types__
 
-    def visit_typeref(self, obj: TypeRefMeta) -> t.OrderedDict:
+    def visit_typeref(self, obj: TypeRefMeta) -> t.Dict:
         return self.visit(self._data_types[obj.__type_name__])
 
 
@@ -287,7 +287,7 @@ class _RecordFieldsValidator(QueryVisitor):
     def __init__(
         self,
         data_types: t.Dict[str, t.Type[Record]],
-        field_types: t.OrderedDict,
+        field_types: t.Dict,
         errors: Errors
     ) -> None:
         self._data_types = data_types
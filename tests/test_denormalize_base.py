@@ -130,3 +130,36 @@ def test_link_optional(value, expected):
             'bar': expected,
         },
     }
+
+
+def test_fields_order():
+    graph = Graph([
+        Node('Foo', [
+            Field('baz', Integer, _),
+        ]),
+        Root([
+            Field('a', Integer, _),
+            Link('foo', TypeRef['Foo'], _, requires=None),
+            Field('b', Integer, _),
+        ]),
+    ])
+    query = build([
+        Q.b,
+        Q.foo[
+            Q.baz,
+        ],
+        Q.a,
+    ])
+    index = Index()
+    index[ROOT.node][ROOT.ident].update({
+        'a': 1,
+        'b': 2,
+        'foo': Reference('Foo', 1),
+    })
+    index['Foo'][1].update({
+        'baz': 42,
+    })
+    result = Proxy(index, ROOT, query)
+    data = Denormalize(graph, result).process(query)
+    assert list(data) == ['b', 'foo', 'a']
+    assert data == {'a': 1, 'b': 2, 'foo': {'baz': 42}}
@@ -0,0 +1,130 @@
+import gc
+
+import pytest
+
+from hiku.types import TypeRef, Integer, Sequence, Optional
+from hiku.graph import Graph, Node, Field, Root, Link
+from hiku.result import ROOT, Proxy, Index, Reference
+from hiku.builder import build, Q
+from hiku.readers.graphql import read
+from hiku.denormalize.base import Denormalize
+from hiku.denormalize.graphql import DenormalizeGraphQL
+from hiku.denormalize.compiler import compile_denormalizer, _CACHE
+
+
+def _(*args):
+    raise NotImplementedError('Data loading not implemented')
+
+
+GRAPH = Graph([
+    Node('Bar', [
+        Field('baz', Integer, _),
+    ]),
+    Node('Foo', [
+        Field('id', Integer, _),
+        Link('bar', Sequence[TypeRef['Bar']], _, requires=None),
+        Link('maybe_bar', Optional[TypeRef['Bar']], _, requires=None),
+    ]),
+    Root([
+        Field('count', Integer, _),
+        Link('foo', TypeRef['Foo'], _, requires=None),
+    ]),
+])
+
+
+def _index(maybe_bar):
+    index = Index()
+    index[ROOT.node][ROOT.ident].update({
+        'count': 2,
+        'foo': Reference('Foo', 1),
+    })
+    index['Foo'][1].update({
+        'id': 1,
+        'bar': [Reference('Bar', 2), Reference('Bar', 3)],
+        'maybe_bar': maybe_bar,
+    })
+    index['Bar'][2].update({
+        'baz': 42
+    })
+    index['Bar'][3].update({
+        'baz': 43
+    })
+    return index
+
+
+@pytest.mark.parametrize('maybe_bar', [None, Reference('Bar', 3)])
+def test_compiled(maybe_bar):
+    query = build([
+        Q.foo[
+            Q.bar[
+                Q.baz,
+            ],
+            Q.maybe_bar[
+                Q.baz,
+            ],
+            Q.id,
+        ],
+        Q.count,
+    ])
+    result = Proxy(_index(maybe_bar), ROOT, query)
+    data = compile_denormalizer(GRAPH, query)(result)
+    assert data == Denormalize(GRAPH, result).process(query)
+    assert list(data) == ['foo', 'count']
+    assert list(data['foo']) == ['bar', 'maybe_bar', 'id']
+
+
+def test_compiled_typename():
+    query = read("""
+    query {
+        __typename
+        foo {
+            __typename
+            bar {
+                __typename
+                baz
+            }
+            maybe_bar {
+                __typename
+                baz
+            }
+        }
+    }
+    """)
+    result = Proxy(_index(Reference('Bar', 2)), ROOT, query)
+    data = compile_denormalizer(GRAPH, query, 'Query')(result)
+    assert data == DenormalizeGraphQL(GRAPH, result, 'Query').process(query)
+
+
+def test_typename_from_data():
+    query = build([
+        Q.__typename,
+        Q.foo[
+            Q.__typename,
+            Q.id,
+        ],
+    ])
+    index = _index(None)
+    index[ROOT.node][ROOT.ident]['__typename'] = 'root-data'
+    index['Foo'][1]['__typename'] = 'foo-data'
+    result = Proxy(index, ROOT, query)
+    data = compile_denormalizer(GRAPH, query)(result)
+    assert data == Denormalize(GRAPH, result).process(query)
+    assert data == {
+        '__typename': 'root-data',
+        'foo': {'__typename': 'foo-data', 'id': 1},
+    }
+
+
+def test_compiled_cache():
+    query = build([Q.count])
+    other_query = build([Q.count])
+    denormalize = compile_denormalizer(GRAPH, query)
+    assert compile_denormalizer(GRAPH, query) is denormalize
+    assert compile_denormalizer(GRAPH, other_query) is not denormalize
+    assert compile_denormalizer(GRAPH, query, 'Query') is not denormalize
+
+    key = (id(query), None)
+    assert key in _CACHE[GRAPH]
+    del query
+    gc.collect()
+    assert key not in _CACHE[GRAPH]
@@ -1,4 +1,4 @@
-from hiku.types import TypeRef, Integer, Sequence
+from hiku.types import TypeRef, Integer, Sequence, Record
 from hiku.graph import Graph, Node, Field, Root, Link
 from hiku.result import ROOT, Proxy, Index, Reference
 from hiku.readers.graphql import read
@@ -63,3 +63,29 @@ def test_typename():
             ],
         },
     }
+
+
+def test_typename_of_shared_record():
+    record = Record[{'baz': Integer}]
+    graph = Graph([
+        Root([
+            Field('foo', TypeRef['Foo'], _),
+            Field('bar', TypeRef['Bar'], _),
+        ]),
+    ], data_types={'Foo': record, 'Bar': record})
+    query = read("""
+    query {
+        foo { __typename baz }
+        bar { __typename baz }
+    }
+    """)
+    index = Index()
+    index[ROOT.node][ROOT.ident].update({
+        'foo': {'baz': 1},
+        'bar': {'baz': 2},
+    })
+    result = Proxy(index, ROOT, query)
+    assert DenormalizeGraphQL(graph, result, 'Query').process(query) == {
+        'foo': {'__typename': 'Foo', 'baz': 1},
+        'bar': {'__typename': 'Bar', 'baz': 2},
+    }
@@ -37,6 +37,27 @@ def test_strip():
     """)
 
 
+def test_strip_unchanged():
+    query = read("""
+    query {
+        foo {
+            __typename
+            bar {
+                baz
+            }
+        }
+        qux {
+            baz
+        }
+    }
+    """)
+    stripped = _StripQuery().visit(query)
+    assert stripped is not query
+    assert stripped.fields_map['foo'].node.fields_map['bar'] is \
+        query.fields_map['foo'].node.fields_map['bar']
+    assert stripped.fields_map['qux'] is query.fields_map['qux']
+
+
 @pytest.fixture(name='sync_graph')
 def sync_graph_fixture():
     def answer(fields):
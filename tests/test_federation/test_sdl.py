@@ -3,9 +3,10 @@ from unittest import TestCase
 from hiku.federation.endpoint import FederatedGraphQLEndpoint
 from hiku.federation.engine import Engine
 from hiku.federation.introspection import FederatedGraphQLIntrospection
-from hiku.federation.sdl import print_sdl
+from hiku.federation.sdl import get_ast, print_sdl
 from hiku.executors.sync import SyncExecutor
-from hiku.graph import apply
+from hiku.graph import Field, Graph, Option, Root, apply
+from hiku.types import Integer, IntegerMeta, Optional, Sequence, String
 
 from tests.test_federation.utils import GRAPH
 
@@ -93,3 +94,48 @@ class TestSDL(TestCase):
             '}'
         ]
         self.assertEqual(sdl.splitlines(), expected)
+
+    def test_print_default_values(self):
+        graph = Graph([
+            Root([
+                Field('foo', String, lambda: None, options=[
+                    Option('ids', Sequence[Integer], default=[1, 2]),
+                    Option('name', String, default='bar'),
+                    Option('limit', Optional[Integer], default=None),
+                ]),
+            ]),
+        ])
+        self.assertEqual(print_sdl(graph).splitlines(), [
+            'scalar Any',
+            '',
+            'extend type Query {',
+            '  foo(ids: [Int!]! = [1, 2], name: String! = "bar", '
+            'limit: Int = null): String!',
+            '}',
+        ])
+
+    def test_print_subclassed_scalar(self):
+        class PositiveMeta(IntegerMeta):
+            pass
+
+        class Positive(metaclass=PositiveMeta):
+            pass
+
+        graph = Graph([
+            Root([
+                Field('foo', Positive, lambda: None),
+                Field('bar', Optional[Positive], lambda: None),
+            ]),
+        ])
+        self.assertEqual(print_sdl(graph).splitlines(), [
+            'scalar Any',
+            '',
+            'extend type Query {',
+            '  foo: Int!',
+            '  bar: Int',
+            '}',
+        ])
+
+    def test_print_sdl_is_cached(self):
+        self.assertIs(get_ast(GRAPH), get_ast(GRAPH))
+        self.assertIs(print_sdl(GRAPH), print_sdl(GRAPH))
@@ -1,3 +1,6 @@
+import copy
+import pickle
+
 from unittest.mock import ANY
 
 import pytest
@@ -11,7 +14,8 @@ from hiku.engine import Engine
 from hiku.executors.sync import SyncExecutor
 from hiku.validate.query import validate
 from hiku.readers.graphql import read
-from hiku.introspection.graphql import GraphQLIntrospection
+from hiku.introspection.graphql import GraphQLIntrospection, Directive
+from hiku.introspection.types import SCALAR, NON_NULL
 from tests.utils import INTROSPECTION_QUERY
 
 
@@ -226,6 +230,18 @@ def test_invalid_names():
     assert err.match('Baz-Baz')
 
 
+@pytest.mark.parametrize('name', ['fóo', 'foo\n', '1foo', ''])
+def test_invalid_field_name(name):
+    graph = Graph([
+        Root([
+            Field(name, Integer, _noop),
+        ]),
+    ])
+    with pytest.raises(ValueError) as err:
+        apply(graph, [GraphQLIntrospection(graph)])
+    assert err.match('Invalid field name')
+
+
 def test_empty_nodes():
     graph = Graph([
         Node('Foo', []),
@@ -344,3 +360,69 @@ def test_untyped_fields():
             _field('any_typed', _ANY),
         ]),
     ])
+
+
+def test_directive_args_types():
+    class Introspection(GraphQLIntrospection):
+        __directives__ = GraphQLIntrospection.__directives__ + (
+            Directive(
+                name='sample',
+                locations=['FIELD'],
+                description='Sample directive',
+                args=[
+                    Directive.Argument(
+                        name='foo',
+                        type_ident=SCALAR('String'),
+                        description='Foo',
+                        default_value=None,
+                    ),
+                    Directive.Argument(
+                        name='bar',
+                        type_ident=NON_NULL(SCALAR('Int')),
+                        description='Bar',
+                        default_value=None,
+                    ),
+                ],
+            ),
+        )
+
+    graph = Graph([Root([Field('foo', Integer, _noop)])])
+    graph = apply(graph, [Introspection(graph)])
+    query = read("""
+    query { __schema { directives {
+        name args { name type { kind name ofType { kind name } } }
+    } } }
+    """)
+    result = denormalize(graph, Engine(SyncExecutor()).execute(graph, query))
+    [sample] = [d for d in result['__schema']['directives']
+                if d['name'] == 'sample']
+    assert sample['args'] == [
+        {'name': 'foo',
+         'type': {'kind': 'SCALAR', 'name': 'String', 'ofType': None}},
+        {'name': 'bar',
+         'type': {'kind': 'NON_NULL', 'name': None,
+                  'ofType': {'kind': 'SCALAR', 'name': 'Int'}}},
+    ]
+
+
+def test_directive_copy():
+    directive = Directive(
+        name='sample',
+        locations=['FIELD'],
+        description='Sample directive',
+        args=[
+            Directive.Argument(
+                name='foo',
+                type_ident=SCALAR('String'),
+                description='Foo',
+                default_value=None,
+            ),
+        ],
+    )
+    for directive_copy in [
+        copy.copy(directive),
+        copy.deepcopy(directive),
+        pickle.loads(pickle.dumps(directive)),
+    ]:
+        assert directive_copy == directive
+        assert directive_copy.args_map == {'foo': directive.args[0]}
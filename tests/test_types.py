@@ -0,0 +1,187 @@
+import sys
+
+from types import MappingProxyType
+
+from hiku.types import (
+    Callable,
+    Integer,
+    Mapping,
+    Optional,
+    Record,
+    Sequence,
+    String,
+    TypeRef,
+    TypeVisitor,
+    TypingMeta,
+)
+
+
+def test_parameterized_types_are_reused():
+    assert Optional[Integer] is Optional[Integer]
+    assert Sequence[TypeRef['foo']] is Sequence[TypeRef['foo']]
+    assert Sequence['foo'] == Sequence[TypeRef['foo']]
+    assert Sequence['foo'].__item_type__ is TypeRef['foo']
+    assert Mapping[String, Integer] is Mapping[String, Integer]
+    assert Callable[[Integer]] is Callable[(Integer,)]
+    assert TypeRef['foo'] is TypeRef['foo']
+
+    assert Optional[Integer] is not Optional[String]
+    assert TypeRef['foo'] is not TypeRef['bar']
+
+
+def test_records_are_not_reused():
+    foo = Record[{'bar': Integer}]
+    baz = Record[{'bar': Integer}]
+    assert foo is not baz
+    assert foo == baz
+    assert Record[[('bar', Integer)]] is not Record[[('bar', Integer)]]
+
+    ba = Record[{'b': String, 'a': Integer}]
+    ab = Record[{'a': Integer, 'b': String}]
+    assert Optional[ab].__type__ is ab
+    assert Optional[ba].__type__ is ba
+    assert list(Optional[ba].__type__.__field_types__) == ['b', 'a']
+    assert Optional[Sequence[ba]].__type__.__item_type__ is ba
+    assert Optional[Sequence[ab]].__type__.__item_type__ is ab
+
+
+def test_record_from_mapping():
+    record = Record[MappingProxyType({'bar': Integer})]
+    assert record.__field_types__ == {'bar': Integer}
+
+
+def test_one_shot_parameters():
+    record = Record[(item for item in [('bar', Integer)])]
+    assert record.__field_types__ == {'bar': Integer}
+    assert record.__field_values__ == (Integer,)
+    callable_ = Callable[(item for item in [Integer])]
+    assert callable_.__arg_types__ == (Integer,)
+
+
+def test_equality():
+    assert Optional[Record[{'foo': Integer}]] == \
+        Optional[Record[{'foo': Integer}]]
+    assert Optional[Record[{'foo': Integer}]] != \
+        Optional[Record[{'foo': String}]]
+    assert Mapping[String, Integer] != Mapping[String, String]
+    assert TypeRef['foo'] != TypeRef['bar']
+    assert Optional != Optional[Integer]
+    assert Optional[Integer] != Sequence[Integer]
+    assert Integer != String
+
+
+def test_undeclared_type_attrs():
+    class EnumMeta(TypingMeta):
+        def __cls_init__(cls, values):
+            cls.__values__ = tuple(values)
+
+        def __cls_repr__(cls):
+            return '{}[{!r}]'.format(cls.__name__, list(cls.__values__))
+
+    class Enum(metaclass=EnumMeta):
+        pass
+
+    assert Enum[['a', 'b']] == Enum[['a', 'b']]
+    assert Enum[['a', 'b']] != Enum[['x', 'y']]
+    # cached repr is not compared
+    assert repr(Enum[['a', 'b']]) == "Enum[['a', 'b']]"
+    assert Enum[['a', 'b']] == Enum[['a', 'b']]
+    assert Optional[Enum[['a', 'b']]].__type__.__values__ == ('a', 'b')
+    assert Optional[Enum[['x', 'y']]].__type__.__values__ == ('x', 'y')
+
+
+def test_hash():
+    assert hash(Optional[Integer]) != hash(Optional[String])
+    assert hash(TypeRef['foo']) != hash(TypeRef['bar'])
+    assert hash(Record[{'foo': Integer, 'bar': String}]) == \
+        hash(Record[{'bar': String, 'foo': Integer}])
+    assert hash(Optional[Record[{'foo': Integer}]]) == \
+        hash(Optional[Record[{'foo': Integer}]])
+
+
+def test_repr():
+    record = Record[{'foo': Optional[Integer], 'bar': Sequence['baz']}]
+    assert repr(record) == (
+        "Record[{'foo': Optional[Integer], 'bar': Sequence[TypeRef['baz']]}]"
+    )
+    assert repr(record) is repr(record)
+
+    class Foo(Optional[Integer]):
+        pass
+
+    assert repr(Foo) == 'Foo[Integer]'
+    assert repr(Optional[Integer]) == 'Optional[Integer]'
+
+
+def test_visitor_dispatch():
+    class CustomMeta(TypingMeta):
+        def __cls_init__(cls, name):
+            cls.__type_name__ = name
+
+        def accept(cls, visitor):
+            return visitor.visit_custom(cls)
+
+    class Custom(metaclass=CustomMeta):
+        pass
+
+    class Visitor(TypeVisitor):
+        def __init__(self):
+            self.visited = []
+
+        def visit_integer(self, obj):
+            self.visited.append(obj)
+
+        def visit_custom(self, obj):
+            self.visited.append(obj.__type_name__)
+
+    visitor = Visitor()
+    visitor.visit(Optional[Sequence[Integer]])
+    visitor.visit(Custom['foo'])
+    assert visitor.visited == [Integer, 'foo']
+
+
+def test_visitor_walk():
+    class Visitor(TypeVisitor):
+        def __init__(self):
+            self.visited = []
+
+        def visit_integer(self, obj):
+            self.visited.append('int')
+
+        def visit_string(self, obj):
+            self.visited.append('str')
+
+        def visit_typeref(self, obj):
+            self.visited.append(obj.__type_name__)
+
+    visitor = Visitor()
+    visitor.visit(Record[{
+        'a': Mapping[String, Integer],
+        'b': Sequence[Optional['foo']],
+        'c': Callable[[Integer, String]],
+    }])
+    assert visitor.visited == ['str', 'int', 'foo', 'int', 'str']
+
+    deep = Integer
+    for _ in range(sys.getrecursionlimit()):
+        deep = Optional[deep]
+    visitor = Visitor()
+    visitor.visit(deep)
+    assert visitor.visited == ['int']
+
+
+def test_visitor_overridden_walk():
+    class Visitor(TypeVisitor):
+        def __init__(self):
+            self.visited = []
+
+        def visit_sequence(self, obj):
+            self.visited.append('seq')
+
+        def visit_integer(self, obj):
+            self.visited.append('int')
+
+    visitor = Visitor()
+    visitor.visit(Optional[Sequence[Integer]])
+    visitor.visit(Optional[Integer])
+    assert visitor.visited == ['seq', 'int']